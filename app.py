@@ -17,6 +17,28 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
+# Swap request listing with the current name, photo and rating of both participants.
+# Names are resolved at read time, so renaming a user never requires rewriting swap_requests rows.
+SWAP_REQUEST_LISTING_QUERY = '''
+    SELECT
+        sr.id,
+        sr.sender_id,
+        sender.name AS sender_name,
+        sender.profile_photo AS sender_photo,
+        sender.average_rating AS sender_rating,
+        sr.receiver_id,
+        receiver.name AS receiver_name,
+        receiver.profile_photo AS receiver_photo,
+        receiver.average_rating AS receiver_rating,
+        sr.skill_offered,
+        sr.skill_wanted,
+        sr.status,
+        sr.created_at
+    FROM swap_requests sr
+    LEFT JOIN users sender ON sender.id = sr.sender_id
+    LEFT JOIN users receiver ON receiver.id = sr.receiver_id
+'''
+
 def get_db_connection():
     """Establishes a connection to the SQLite database."""
     conn = sqlite3.connect(DATABASE)
@@ -51,13 +73,12 @@ def init_db():
     ''')
 
     # Create swap_requests table
+    # Participant names are not stored here; listings join against users so renames show up immediately.
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS swap_requests (
             id TEXT PRIMARY KEY,
             sender_id TEXT NOT NULL,
-            sender_name TEXT NOT NULL,
             receiver_id TEXT NOT NULL,
-            receiver_name TEXT NOT NULL,
             skill_offered TEXT NOT NULL,
             skill_wanted TEXT NOT NULL,
             status TEXT DEFAULT 'pending', -- 'pending', 'accepted', 'rejected', 'completed'
@@ -67,6 +88,44 @@ def init_db():
         )
     ''')
 
+    # Migrate databases created before names were dropped from swap_requests.
+    # SQLite can't reliably drop columns on older versions, so rebuild the table instead.
+    cursor.execute("PRAGMA table_info(swap_requests)")
+    swap_request_columns = [column['name'] for column in cursor.fetchall()]
+    if 'sender_name' in swap_request_columns or 'receiver_name' in swap_request_columns:
+        # Run the rebuild in one explicit transaction so an interrupted migration leaves the old table intact.
+        cursor.execute("BEGIN")
+        cursor.execute("DROP TABLE IF EXISTS swap_requests_new")
+        cursor.execute('''
+            CREATE TABLE swap_requests_new (
+                id TEXT PRIMARY KEY,
+                sender_id TEXT NOT NULL,
+                receiver_id TEXT NOT NULL,
+                skill_offered TEXT NOT NULL,
+                skill_wanted TEXT NOT NULL,
+                status TEXT DEFAULT 'pending', -- 'pending', 'accepted', 'rejected', 'completed'
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (sender_id) REFERENCES users (id),
+                FOREIGN KEY (receiver_id) REFERENCES users (id)
+            )
+        ''')
+        cursor.execute('''
+            INSERT INTO swap_requests_new (id, sender_id, receiver_id, skill_offered, skill_wanted, status, created_at)
+            SELECT id, sender_id, receiver_id, skill_offered, skill_wanted, status, created_at FROM swap_requests
+        ''')
+        cursor.execute("DROP TABLE swap_requests")
+        cursor.execute("ALTER TABLE swap_requests_new RENAME TO swap_requests")
+        conn.commit()
+        print("Migrated swap_requests: removed denormalized sender_name/receiver_name columns.")
+
+    # Indexes backing the swap request listings.
+    # The swap_requests indexes serve the per-user and admin listings in created_at order;
+    # idx_users_listing covers the name/photo/rating lookups so the joins never touch the users table.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_swap_requests_sender ON swap_requests (sender_id, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_swap_requests_receiver ON swap_requests (receiver_id, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_swap_requests_created_at ON swap_requests (created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_listing ON users (id, name, profile_photo, average_rating)")
+
     # Create feedback table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS feedback (
@@ -382,13 +441,11 @@ def create_swap_request():
     """Creates a new swap request."""
     data = request.get_json()
     sender_id = data.get('senderId')
-    sender_name = data.get('senderName')
     receiver_id = data.get('receiverId')
-    receiver_name = data.get('receiverName')
     skill_offered = data.get('skillOffered')
     skill_wanted = data.get('skillWanted')
 
-    if not all([sender_id, sender_name, receiver_id, receiver_name, skill_offered, skill_wanted]):
+    if not all([sender_id, receiver_id, skill_offered, skill_wanted]):
         return jsonify({"error": "Missing required fields"}), 400
     
     if sender_id == receiver_id:
@@ -397,10 +454,15 @@ def create_swap_request():
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
+        # Names are resolved from users at read time, so both participants must exist
+        cursor.execute("SELECT id FROM users WHERE id IN (?, ?)", (sender_id, receiver_id))
+        if len(cursor.fetchall()) != 2:
+            return jsonify({"error": "Sender or receiver not found"}), 404
+
         request_id = str(uuid.uuid4())
         cursor.execute(
-            "INSERT INTO swap_requests (id, sender_id, sender_name, receiver_id, receiver_name, skill_offered, skill_wanted, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-            (request_id, sender_id, sender_name, receiver_id, receiver_name, skill_offered, skill_wanted, 'pending')
+            "INSERT INTO swap_requests (id, sender_id, receiver_id, skill_offered, skill_wanted, status) VALUES (?, ?, ?, ?, ?, ?)",
+            (request_id, sender_id, receiver_id, skill_offered, skill_wanted, 'pending')
         )
         conn.commit()
         return jsonify({"message": "Swap request sent successfully", "requestId": request_id}), 201
@@ -418,7 +480,7 @@ def get_user_swap_requests(user_id):
     cursor = conn.cursor()
     try:
         cursor.execute(
-            "SELECT * FROM swap_requests WHERE sender_id = ? OR receiver_id = ? ORDER BY created_at DESC",
+            SWAP_REQUEST_LISTING_QUERY + " WHERE sr.sender_id = ? OR sr.receiver_id = ? ORDER BY sr.created_at DESC",
             (user_id, user_id)
         )
         requests = cursor.fetchall()
@@ -643,7 +705,7 @@ def admin_get_all_swap_requests():
     # In a real app, you'd add authentication/authorization for admin access here
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM swap_requests ORDER BY created_at DESC")
+    cursor.execute(SWAP_REQUEST_LISTING_QUERY + " ORDER BY sr.created_at DESC")
     requests = cursor.fetchall()
     conn.close()
     print(f"Admin: Fetched {len(requests)} total swap requests.") # Debug print
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+import uuid
+
+# app.py initializes the database and upload folder relative to the working
+# directory at import time, so import it from a scratch directory.
+_original_cwd = os.getcwd()
+_scratch_dir = tempfile.TemporaryDirectory()
+os.chdir(_scratch_dir.name)
+try:
+    import app
+finally:
+    os.chdir(_original_cwd)
+
+
+class SwapRequestListingQueryPlanTest(unittest.TestCase):
+    """Guards the swap request listings against regressing to full table scans."""
+
+    def setUp(self):
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.original_database = app.DATABASE
+        app.DATABASE = os.path.join(self.db_dir.name, 'skill_swap.db')
+        app.init_db()
+
+        conn = app.get_db_connection()
+        user_ids = [str(uuid.uuid4()) for _ in range(500)]
+        conn.executemany(
+            "INSERT INTO users (id, name, password_hash, bio) VALUES (?, ?, ?, ?)",
+            [(user_id, f"User {i}", 'hash', 'bio ' * 50) for i, user_id in enumerate(user_ids)]
+        )
+        conn.executemany(
+            "INSERT INTO swap_requests (id, sender_id, receiver_id, skill_offered, skill_wanted) VALUES (?, ?, ?, ?, ?)",
+            [
+                (str(uuid.uuid4()), user_ids[i % 500], user_ids[(i * 7 + 1) % 500], 'Python', 'Guitar')
+                for i in range(2000)
+            ]
+        )
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        app.DATABASE = self.original_database
+        self.db_dir.cleanup()
+
+    def explain(self, query, params=()):
+        conn = app.get_db_connection()
+        try:
+            return [row['detail'] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params)]
+        finally:
+            conn.close()
+
+    def assert_users_joins_covered(self, plan):
+        for alias in ('sender', 'receiver'):
+            self.assertTrue(
+                any(detail.startswith(f"SEARCH {alias} USING COVERING INDEX idx_users_listing") for detail in plan),
+                plan
+            )
+            self.assertFalse(any(detail.startswith(f"SCAN {alias}") for detail in plan), plan)
+
+    def test_user_listing_uses_indexes(self):
+        plan = self.explain(
+            app.SWAP_REQUEST_LISTING_QUERY + " WHERE sr.sender_id = ? OR sr.receiver_id = ? ORDER BY sr.created_at DESC",
+            ('some-user', 'some-user')
+        )
+        self.assertFalse(any(detail.startswith("SCAN sr") for detail in plan), plan)
+        self.assert_users_joins_covered(plan)
+
+    def test_admin_listing_uses_indexes(self):
+        plan = self.explain(app.SWAP_REQUEST_LISTING_QUERY + " ORDER BY sr.created_at DESC")
+        self.assertIn("SCAN sr USING INDEX idx_swap_requests_created_at", plan)
+        self.assert_users_joins_covered(plan)
+
+
+class CreateSwapRequestTest(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.original_database = app.DATABASE
+        app.DATABASE = os.path.join(self.db_dir.name, 'skill_swap.db')
+        app.init_db()
+        self.client = app.app.test_client()
+
+    def tearDown(self):
+        app.DATABASE = self.original_database
+        self.db_dir.cleanup()
+
+    def test_rejects_unknown_participant(self):
+        conn = app.get_db_connection()
+        sender_id = conn.execute("SELECT id FROM users LIMIT 1").fetchone()['id']
+        conn.close()
+
+        response = self.client.post('/api/swap_requests', json={
+            'senderId': sender_id,
+            'receiverId': 'missing-user',
+            'skillOffered': 'Python',
+            'skillWanted': 'Guitar',
+        })
+
+        self.assertEqual(response.status_code, 404)
+        conn = app.get_db_connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM swap_requests").fetchone()[0], 0)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()